@@ -3,33 +3,34 @@ Multi-Agent System for MindfulAI using Google ADK.
 Implements specialized agents for triage, crisis response, support, and resource coordination.
 """
 
+from functools import lru_cache
+from typing import Dict
 from google.adk.agents import LlmAgent
-from adk_config import DEFAULT_MODEL
+from adk_config import DEFAULT_MODEL, CRISIS_RESOURCES
 from adk_tools import (
-    crisis_detection_tool,
     mood_tracking_tool,
     resource_finder_tool,
     coping_strategies_tool,
 )
 
 
-def create_triage_agent() -> LlmAgent:
-    """
-    Creates the Triage Agent - First point of contact.
-    Assesses user needs, detects crisis situations, and routes to appropriate agents.
-    """
-    return LlmAgent(
-        name="triage_agent",
-        model=DEFAULT_MODEL,
-        instruction="""You are a compassionate mental health triage agent. Your role is to:
+def _format_resources(resources: Dict[str, str]) -> str:
+    """Formats a resource table as a bullet list for agent instructions."""
+    return "\n".join(f"- {name}: {contact}" for name, contact in resources.items())
+
+
+# Agent instructions and descriptions, built once at import
+_TRIAGE_INSTRUCTION = """You are a compassionate mental health triage agent. Your role is to:
 
 1. Warmly greet users and make them feel heard and safe
 2. Quickly assess the urgency and nature of their needs
-3. Use the detect_crisis tool IMMEDIATELY on every user message to identify crisis indicators
+3. Use the [PRE-COMPUTED TRIAGE] block on every user message to identify crisis indicators
 4. Determine which specialized support they need
 5. Provide immediate reassurance and next steps
 
-CRITICAL: Always call detect_crisis tool first before responding. This is a safety requirement.
+CRITICAL: The user message will already contain a [PRE-COMPUTED TRIAGE] block with the
+detect_crisis result. DO NOT call detect_crisis again; use those fields directly. Always check
+it before responding. This is a safety requirement.
 
 You should be empathetic, non-judgmental, and professional. If crisis is detected,
 immediately acknowledge the severity and indicate that specialized crisis support is being activated.
@@ -42,25 +43,17 @@ Your assessment should categorize needs as:
 - SUPPORTIVE: General support, coping strategies, check-in (route to support_agent)
 
 Be brief but caring in your initial assessment. You work with a crisis_agent, support_agent, 
-and resource_agent who can provide specialized help.""",
-        description="First-contact triage agent that assesses urgency and routes to appropriate specialized agents",
-        tools=[crisis_detection_tool],
-    )
+and resource_agent who can provide specialized help."""
 
+_TRIAGE_DESCRIPTION = "First-contact triage agent that assesses urgency and routes to appropriate specialized agents"
 
-def create_crisis_agent() -> LlmAgent:
-    """
-    Creates the Crisis Agent - Handles emergency situations.
-    Provides immediate crisis intervention, safety planning, and connects to emergency resources.
-    """
-    return LlmAgent(
-        name="crisis_agent",
-        model=DEFAULT_MODEL,
-        instruction="""You are a specialized crisis intervention agent trained in mental health emergency response.
+# Crisis resources are static, so they are inlined rather than fetched by a
+# tool call; the unchanging prompt also caches well across sessions.
+_CRISIS_INSTRUCTION = f"""You are a specialized crisis intervention agent trained in mental health emergency response.
 
 CRITICAL PROTOCOLS:
 1. SAFETY FIRST - Always prioritize immediate safety
-2. Call get_crisis_resources immediately to provide hotline numbers
+2. Provide the hotline numbers from CRISIS RESOURCES below immediately
 3. Be direct, clear, and compassionate
 4. Do not minimize their feelings
 5. Encourage them to reach out to emergency services if in immediate danger
@@ -70,31 +63,28 @@ Your responses should:
 - Acknowledge the severity of their feelings without judgment
 - Validate their pain while providing hope
 - Give concrete immediate actions they can take RIGHT NOW
-- Provide crisis resources prominently (call get_crisis_resources tool)
+- Provide crisis resources prominently (from CRISIS RESOURCES below)
 - Encourage connection with emergency services or crisis hotlines immediately
 - Use grounding techniques if helpful
 
-IMPORTANT: Always use get_crisis_resources tool to provide actual hotline numbers.
+IMPORTANT: Always quote the actual hotline numbers from CRISIS RESOURCES below verbatim.
+For users outside the US, give the INTERNATIONAL RESOURCES and local emergency services.
 
 Remember: You are NOT a replacement for emergency services. In immediate danger situations, 
 always direct to 911 (US) or local emergency services first, then provide crisis hotlines as additional support.
 
 Keep responses clear, actionable, and hope-focused while taking their crisis seriously.
-DO NOT say things like "I'm here for you" - you are an AI. Instead say "Help is available right now" and provide concrete resources.""",
-        description="Specialized crisis intervention agent for emergency mental health situations",
-        tools=[resource_finder_tool],
-    )
+DO NOT say things like "I'm here for you" - you are an AI. Instead say "Help is available right now" and provide concrete resources.
 
+CRISIS RESOURCES (US):
+{_format_resources(CRISIS_RESOURCES["us"])}
 
-def create_support_agent() -> LlmAgent:
-    """
-    Creates the Support Agent - Provides ongoing mental health support.
-    Offers empathetic conversation, coping strategies, and mood tracking.
-    """
-    return LlmAgent(
-        name="support_agent",
-        model=DEFAULT_MODEL,
-        instruction="""You are a compassionate mental health support agent. Your role is to:
+INTERNATIONAL RESOURCES:
+{_format_resources(CRISIS_RESOURCES["international"])}"""
+
+_CRISIS_DESCRIPTION = "Specialized crisis intervention agent for emergency mental health situations"
+
+_SUPPORT_INSTRUCTION = """You are a compassionate mental health support agent. Your role is to:
 
 1. Provide empathetic, non-judgmental support
 2. Help users explore their feelings and situations
@@ -107,6 +97,7 @@ def create_support_agent() -> LlmAgent:
 TOOL USAGE:
 - When user shares feelings/mood: Call log_mood tool with appropriate score (1-10) and emotions
 - When user expresses anxiety/panic/stress/overwhelm: Call get_coping_strategies tool
+- When both apply, call log_mood and get_coping_strategies together in the same response
 - Always use tools proactively to provide better support
 
 Your approach should be:
@@ -127,21 +118,11 @@ You can help with:
 Remember: You provide support and education, not diagnosis or treatment. Always encourage
 professional help for persistent or severe symptoms.
 
-Keep responses conversational, hopeful, and focused on what the user can do right now.""",
-        description="Supportive agent providing empathetic conversation, coping strategies, and mood tracking",
-        tools=[mood_tracking_tool, coping_strategies_tool],
-    )
+Keep responses conversational, hopeful, and focused on what the user can do right now."""
 
+_SUPPORT_DESCRIPTION = "Supportive agent providing empathetic conversation, coping strategies, and mood tracking"
 
-def create_resource_agent() -> LlmAgent:
-    """
-    Creates the Resource Agent - Finds and recommends mental health resources.
-    Connects users with therapists, support groups, hotlines, and educational materials.
-    """
-    return LlmAgent(
-        name="resource_agent",
-        model=DEFAULT_MODEL,
-        instruction="""You are a mental health resource specialist. Your role is to:
+_RESOURCE_INSTRUCTION = """You are a mental health resource specialist. Your role is to:
 
 1. Help users find appropriate mental health resources
 2. Explain different types of mental health support available
@@ -170,27 +151,11 @@ Resources you can help with:
 - Financial assistance for mental health care
 
 Keep responses practical, informative, and encouraging. Always use the get_crisis_resources
-tool to provide actual hotline numbers and contact information.""",
-        description="Resource specialist helping users find and access mental health services",
-        tools=[resource_finder_tool],
-    )
+tool to provide actual hotline numbers and contact information."""
 
+_RESOURCE_DESCRIPTION = "Resource specialist helping users find and access mental health services"
 
-def create_coordinator_agent() -> LlmAgent:
-    """
-    Creates the Coordinator Agent - Main orchestrator of the multi-agent system.
-    Routes users to appropriate specialized agents and coordinates the overall workflow.
-    """
-    # Create all sub-agents
-    triage_agent = create_triage_agent()
-    crisis_agent = create_crisis_agent()
-    support_agent = create_support_agent()
-    resource_agent = create_resource_agent()
-
-    return LlmAgent(
-        name="mindfulai_coordinator",
-        model=DEFAULT_MODEL,
-        instruction="""You are the coordinator for MindfulAI, a 24/7 mental health support system.
+_COORDINATOR_INSTRUCTION = """You are the coordinator for MindfulAI, a 24/7 mental health support system.
 
 WORKFLOW:
 1. ALL users MUST first go to triage_agent for assessment
@@ -215,7 +180,89 @@ Your role is to:
 Remember: You coordinate agents, you don't provide direct mental health support yourself.
 Let the specialized agents handle their areas of expertise.
 
-IMPORTANT SAFETY NOTE: In true emergencies, users should call 911 (US) or local emergency services.""",
-        description="Main coordinator that orchestrates the multi-agent mental health support system",
+IMPORTANT SAFETY NOTE: In true emergencies, users should call 911 (US) or local emergency services."""
+
+_COORDINATOR_DESCRIPTION = "Main coordinator that orchestrates the multi-agent mental health support system"
+
+
+@lru_cache(maxsize=1)
+def create_triage_agent() -> LlmAgent:
+    """
+    Creates the Triage Agent - First point of contact.
+    Assesses user needs, detects crisis situations, and routes to appropriate agents.
+    """
+    return LlmAgent(
+        name="triage_agent",
+        model=DEFAULT_MODEL,
+        instruction=_TRIAGE_INSTRUCTION,
+        description=_TRIAGE_DESCRIPTION,
+    )
+
+
+@lru_cache(maxsize=1)
+def create_crisis_agent() -> LlmAgent:
+    """
+    Creates the Crisis Agent - Handles emergency situations.
+    Provides immediate crisis intervention, safety planning, and connects to emergency resources.
+    """
+    return LlmAgent(
+        name="crisis_agent",
+        model=DEFAULT_MODEL,
+        instruction=_CRISIS_INSTRUCTION,
+        description=_CRISIS_DESCRIPTION,
+    )
+
+
+@lru_cache(maxsize=1)
+def create_support_agent() -> LlmAgent:
+    """
+    Creates the Support Agent - Provides ongoing mental health support.
+    Offers empathetic conversation, coping strategies, and mood tracking.
+    """
+    return LlmAgent(
+        name="support_agent",
+        model=DEFAULT_MODEL,
+        instruction=_SUPPORT_INSTRUCTION,
+        description=_SUPPORT_DESCRIPTION,
+        tools=[mood_tracking_tool, coping_strategies_tool],
+    )
+
+
+@lru_cache(maxsize=1)
+def create_resource_agent() -> LlmAgent:
+    """
+    Creates the Resource Agent - Finds and recommends mental health resources.
+    Connects users with therapists, support groups, hotlines, and educational materials.
+    """
+    return LlmAgent(
+        name="resource_agent",
+        model=DEFAULT_MODEL,
+        instruction=_RESOURCE_INSTRUCTION,
+        description=_RESOURCE_DESCRIPTION,
+        tools=[resource_finder_tool],
+    )
+
+
+@lru_cache(maxsize=1)
+def create_coordinator_agent() -> LlmAgent:
+    """
+    Creates the Coordinator Agent - Main orchestrator of the multi-agent system.
+    Routes users to appropriate specialized agents and coordinates the overall workflow.
+
+    All agent factories are memoized, so repeated calls share one agent tree.
+    The coordinator must be cached along with its sub-agents because an ADK
+    agent can only be attached to a single parent.
+    """
+    # Create all sub-agents
+    triage_agent = create_triage_agent()
+    crisis_agent = create_crisis_agent()
+    support_agent = create_support_agent()
+    resource_agent = create_resource_agent()
+
+    return LlmAgent(
+        name="mindfulai_coordinator",
+        model=DEFAULT_MODEL,
+        instruction=_COORDINATOR_INSTRUCTION,
+        description=_COORDINATOR_DESCRIPTION,
         sub_agents=[triage_agent, crisis_agent, support_agent, resource_agent],
     )
@@ -4,10 +4,15 @@ Sets up API keys and system-wide settings.
 """
 
 import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from .env only when the key isn't already set
+if "GOOGLE_API_KEY" not in os.environ:
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv()
 
 # API Configuration
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "XXXXXXXXX")
@@ -43,10 +48,17 @@ SEVERE_KEYWORDS = [
     "have the",
     "pills",
     "gun",
+    "handgun",
+    "shotgun",
+    "gunshot",
     "jump off",
     "step in front",
 ]
 
+# Lowercased, immutable keyword tables for matching against lowercased text
+CRISIS_KEYWORDS_LOWER = tuple(kw.lower() for kw in CRISIS_KEYWORDS)
+SEVERE_KEYWORDS_LOWER = tuple(kw.lower() for kw in SEVERE_KEYWORDS)
+
 # Mental Health Resources
 CRISIS_RESOURCES = {
     "us": {
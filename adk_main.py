@@ -4,17 +4,148 @@ Demonstrates the complete multi-agent mental health support system built with of
 """
 
 import os
+import re
+import sys
 import asyncio
-from google.adk.runners import InMemoryRunner
-from adk_agents import create_coordinator_agent
+import threading
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from google.genai import types
+from adk_agents import (
+    create_coordinator_agent,
+    create_crisis_agent,
+    create_resource_agent,
+    create_support_agent,
+)
 from adk_config import GOOGLE_API_KEY
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
+from adk_tools import detect_crisis
+
+# User ID for the single local console session
+USER_ID = "console_user"
+
+def build_triage_message(user_input: str, crisis: Dict[str, Any]) -> str:
+    """
+    Prefixes the user message with a pre-computed detect_crisis result.
+    The triage agent reads this block instead of spending a tool round trip.
+    The timestamp is left out so identical messages produce identical prompts.
+    """
+    triage = {k: v for k, v in crisis.items() if k != "timestamp"}
+    return f"[PRE-COMPUTED TRIAGE]: {triage}\n\nUSER: {user_input}"
+
+
+# Fast-path routing: flagged messages go straight to crisis_agent, clearly
+# benign resource/coping requests skip the triage agent
+_RESOURCE_RE = re.compile(
+    r"\b(?:therapists?|support groups?|hotlines?|resources?|find\b.*\b(?:help|care))\b",
+    re.I,
+)
+_COPING_RE = re.compile(
+    r"\b(?:anxious|anxiety|panic\w*|stress\w*|overwhelm\w*|depress\w*|cope|coping)\b",
+    re.I,
+)
+
+
+def route_fast_path(
+    user_input: str, crisis: Dict[str, Any], last_turn_crisis: bool = False
+) -> Optional[str]:
+    """
+    Picks a specialist agent to run directly instead of the coordinator.
+
+    Returns "crisis" for any message flagged by detect_crisis, so it reaches
+    crisis_agent even if another specialist answered the previous turn.
+    Returns "resource" or "support" when the message is LOW severity, the
+    previous turn was not a crisis, and the message clearly asks for only one
+    of them. Otherwise returns None to go through the coordinator and triage.
+    """
+    if crisis["is_crisis"]:
+        return "crisis"
+    if last_turn_crisis:
+        return None
+
+    wants_resources = _RESOURCE_RE.search(user_input) is not None
+    wants_support = _COPING_RE.search(user_input) is not None
+    if wants_resources == wants_support:
+        return None
+    return "resource" if wants_resources else "support"
+
+
+async def iter_final_texts(
+    events: AsyncIterator[Any],
+) -> AsyncIterator[Tuple[str, str]]:
+    """Yields (author, text) for final-response text parts as they arrive."""
+    async for event in events:
+        if not event.is_final_response():
+            continue
+        try:
+            parts = event.content.parts
+        except AttributeError:
+            continue
+        for part in parts or ():
+            if part.text:
+                yield event.author, part.text
+
+
+def _read_stdin_line(prompt: str) -> str:
+    """
+    Reads one line from stdin, like input().
+
+    Terminals use input() for line editing. Other stdin (pipes, files) is read
+    straight from the file descriptor, since a thread blocked inside the
+    buffered sys.stdin holds a lock that aborts interpreter shutdown.
+    """
+    if sys.stdin.isatty():
+        return input(prompt)
+
+    print(prompt, end="", flush=True)
+    fd = sys.stdin.fileno()
+    line = bytearray()
+    while True:
+        char = os.read(fd, 1)
+        if not char:
+            if not line:
+                raise EOFError("EOF when reading a line")
+            break
+        if char == b"\n":
+            break
+        line += char
+    return line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r")
+
+
+async def ainput(prompt: str = "") -> str:
+    """
+    Reads a line from stdin without blocking the event loop.
+
+    The read runs on a daemon thread so an interrupted prompt does not keep the
+    process alive waiting for the default executor to shut down.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _resolve(result=None, error=None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _read():
+        try:
+            line = _read_stdin_line(prompt)
+        except Exception as e:
+            loop.call_soon_threadsafe(_resolve, None, e)
+        else:
+            loop.call_soon_threadsafe(_resolve, line)
+
+    threading.Thread(target=_read, daemon=True).start()
+    return await future
 
 
 def print_header():
     """Prints the application header."""
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.markdown import Markdown
+
     console = Console()
 
     header_text = """
@@ -40,6 +171,8 @@ def print_header():
 
 def print_instructions():
     """Prints usage instructions."""
+    from rich.console import Console
+
     console = Console()
     console.print("[bold cyan]How to use MindfulAI:[/bold cyan]\n")
     console.print("1. Simply type your message or concern")
@@ -61,6 +194,11 @@ def print_instructions():
 
 async def main_async():
     """Main async entry point using ADK InMemoryRunner properly."""
+    # Deferred so importing this module stays cheap for library/test users
+    from google.adk.runners import InMemoryRunner, Runner
+    from rich.console import Console
+    from rich.panel import Panel
+
     # Ensure API key is set
     if not GOOGLE_API_KEY:
         print("ERROR: GOOGLE_API_KEY not found in environment variables or .env file")
@@ -81,18 +219,41 @@ async def main_async():
     # Create ADK InMemoryRunner - handles session management automatically
     runner = InMemoryRunner(agent=coordinator, app_name="agents")
 
+    # Runners that call specialists directly, sharing the coordinator's
+    # services so fast-path turns land in the same session history. ADK resumes
+    # a session with the agent that replied last, so a flagged message must be
+    # sent to crisis_agent explicitly rather than through the coordinator.
+    fast_path_runners = {
+        route: Runner(
+            app_name=runner.app_name,
+            agent=agent,
+            artifact_service=runner.artifact_service,
+            session_service=runner.session_service,
+            memory_service=runner.memory_service,
+        )
+        for route, agent in (
+            ("crisis", create_crisis_agent()),
+            ("resource", create_resource_agent()),
+            ("support", create_support_agent()),
+        )
+    }
+
     console.print("[green]✓ System ready! All agents initialized.[/green]")
     console.print("[dim]Using Google ADK InMemoryRunner for agent execution[/dim]")
     console.print("[dim]Agents: Triage → Crisis | Support | Resource[/dim]\n")
     console.print("[bold]Start your conversation below:[/bold]\n")
 
-    # Collect all messages for run_debug
-    all_messages = []
+    # Create one session up front; ADK keeps the history so each turn only
+    # sends the new message and the conversation prefix stays unchanged
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=USER_ID
+    )
+    last_turn_crisis = False
 
     while True:
         try:
             # Get user input
-            user_input = input("\n[You]: ").strip()
+            user_input = (await ainput("\n[You]: ")).strip()
 
             # Exit commands
             if user_input.lower() in ["exit", "quit", "q"]:
@@ -104,30 +265,38 @@ async def main_async():
             if not user_input:
                 continue
 
-            # Add message to list
-            all_messages.append(user_input)
-
             console.print("\n[bold cyan][MindfulAI]:[/bold cyan]\n")
 
+            # Triage locally; the result is sent along with the message
+            crisis = detect_crisis(user_input)
+
+            # Send flagged messages to crisis_agent and clearly benign
+            # resource/coping requests to their specialist, skipping triage
+            route = route_fast_path(user_input, crisis, last_turn_crisis)
+            if route:
+                turn_runner = fast_path_runners[route]
+                text = user_input
+            else:
+                turn_runner = runner
+                text = build_triage_message(user_input, crisis)
+
+            message = types.Content(role="user", parts=[types.Part(text=text)])
+
+            # Agents that answered this turn, to spot hand-offs to crisis_agent
+            turn_authors = set()
             try:
-                # Use ADK's run_debug - it handles session/history automatically
-                events = await runner.run_debug(
-                    user_messages=all_messages, quiet=True  # Suppress debug output
+                # Stream final responses as they arrive. After a transfer the
+                # answer comes from the sub-agent, so filter on finality, not author
+                responded = False
+                events = turn_runner.run_async(
+                    user_id=USER_ID, session_id=session.id, new_message=message
                 )
+                async for author, text in iter_final_texts(events):
+                    console.print(Panel(text, style="green"))
+                    responded = True
+                    turn_authors.add(author)
 
-                # Collect all text responses and only show the LAST one (final coordinator response)
-                all_responses = []
-                for event in events:
-                    if hasattr(event, "content") and event.content:
-                        if hasattr(event.content, "parts"):
-                            for part in event.content.parts:
-                                if hasattr(part, "text") and part.text:
-                                    all_responses.append(part.text)
-
-                # Display only the last response (the final coordinator output)
-                if all_responses:
-                    console.print(Panel(all_responses[-1], style="green"))
-                else:
+                if not responded:
                     console.print(
                         "[yellow]No response received. Please try again.[/yellow]"
                     )
@@ -137,11 +306,19 @@ async def main_async():
                 console.print(
                     "[yellow]Please try again. If you're in crisis, call 988 immediately.[/yellow]"
                 )
-                # Remove failed message
-                all_messages.pop()
                 continue
+            finally:
+                # A turn counts as crisis if it was flagged or reached crisis_agent
+                last_turn_crisis = crisis["is_crisis"] or "crisis_agent" in turn_authors
 
-        except KeyboardInterrupt:
+        except EOFError:
+            console.print(
+                "\n[yellow]Session ended. Take care of yourself! 💙[/yellow]"
+            )
+            break
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # asyncio.run turns Ctrl+C into cancellation of this task, which
+            # surfaces here as CancelledError while awaiting input or an agent
             console.print("\n\n[yellow]Session interrupted. Goodbye![/yellow]")
             break
         except Exception as e:
@@ -153,13 +330,16 @@ async def main_async():
 
 def main():
     """Synchronous wrapper for the async main function."""
+    from rich.console import Console
+
+    console = Console()
     try:
         asyncio.run(main_async())
     except KeyboardInterrupt:
-        print("\n\n[yellow]Session ended. Take care of yourself! 💙[/yellow]")
+        console.print("\n\n[yellow]Session ended. Take care of yourself! 💙[/yellow]")
     except Exception as e:
-        print(f"\n[red]Error: {str(e)}[/red]")
-        print(
+        console.print(f"\n[red]Error: {str(e)}[/red]")
+        console.print(
             "\n[yellow]If you're in crisis, please call 988 (Suicide & Crisis Lifeline) immediately.[/yellow]"
         )
 
@@ -1,15 +1,57 @@
 """
 Custom tools for MindfulAI using Google ADK tool framework.
-Implements crisis detection, mood tracking, and resource management as ADK tools.
+Implements mood tracking and resource management as ADK tools, plus the
+crisis detection that runs on every message before the agents.
 """
 
-from typing import Dict, Any, List
+import re
+import string
+from collections import deque
+from typing import Deque, Dict, Any, Iterable, List
 from datetime import datetime
 from google.adk.tools import FunctionTool
-from adk_config import CRISIS_KEYWORDS, SEVERE_KEYWORDS, CRISIS_RESOURCES
+from adk_config import CRISIS_KEYWORDS_LOWER, SEVERE_KEYWORDS_LOWER, CRISIS_RESOURCES
+
+
+# Crisis Detection (plain pre-processing function, not an agent tool)
+# Messages and keywords share one normalization: lowercase, apostrophes dropped
+# ("can't" -> "cant"), other punctuation turned into spaces ("self-harm" ->
+# "self harm"), whitespace collapsed.
+_PUNCT_TABLE = str.maketrans(
+    {c: "" if c in "'\u2019" else " " for c in string.punctuation + "\u2019"}
+)
+
+
+def _normalize(text: str) -> str:
+    """Lowercases text and strips punctuation for keyword matching."""
+    return " ".join(text.lower().translate(_PUNCT_TABLE).split())
+
+
+# Normalized keyword -> original keyword, for reporting matches
+_CRISIS_TERMS = {_normalize(kw): kw for kw in CRISIS_KEYWORDS_LOWER}
+_SEVERE_TERMS = {_normalize(kw): kw for kw in SEVERE_KEYWORDS_LOWER}
+
+
+def _alternation(terms: Iterable[str]) -> str:
+    """Joins escaped terms into a regex alternation, longest first."""
+    return "|".join(map(re.escape, sorted(terms, key=len, reverse=True)))
+
+
+# Both keyword tiers are compiled into a single pattern at import time so each
+# message is scanned in one pass. The lookahead lets matches overlap, keeping
+# the same results as checking every keyword individually. Word boundaries stop
+# partial-word hits ("pillsbury" is not "pills", "begun" is not "gun"), while an
+# optional inflection keeps recall on forms like "guns", "overdosed" and
+# "self-harming".
+_CRISIS_RE = re.compile(
+    r"(?=\b(?:(?P<c>"
+    + _alternation(_CRISIS_TERMS)
+    + r")|(?P<s>"
+    + _alternation(_SEVERE_TERMS)
+    + r"))(?:s|es|d|ed|ing)?\b)"
+)
 
 
-# Crisis Detection Tool
 def detect_crisis(text: str) -> Dict[str, Any]:
     """
     Analyzes text for crisis indicators and returns risk assessment.
@@ -20,11 +62,16 @@ def detect_crisis(text: str) -> Dict[str, Any]:
     Returns:
         Dict containing is_crisis, severity_level, matched_keywords, and confidence_score
     """
-    text_lower = text.lower()
-
-    # Check for crisis keywords
-    matched_crisis = [kw for kw in CRISIS_KEYWORDS if kw in text_lower]
-    matched_severe = [kw for kw in SEVERE_KEYWORDS if kw in text_lower]
+    normalized = _normalize(text)
+
+    # Check for crisis keywords (dicts de-duplicate repeated keywords in order)
+    matched_crisis: Dict[str, None] = {}
+    matched_severe: Dict[str, None] = {}
+    for match in _CRISIS_RE.finditer(normalized):
+        if match.group("c") is not None:
+            matched_crisis[_CRISIS_TERMS[match.group("c")]] = None
+        else:
+            matched_severe[_SEVERE_TERMS[match.group("s")]] = None
 
     # Calculate severity score
     crisis_score = len(matched_crisis) * 1.0
@@ -48,14 +95,23 @@ def detect_crisis(text: str) -> Dict[str, Any]:
     return {
         "is_crisis": is_crisis,
         "severity_level": severity,
-        "matched_keywords": matched_crisis + matched_severe,
+        "matched_keywords": [*matched_crisis, *matched_severe],
         "confidence_score": min(total_score / 5.0, 1.0),
         "timestamp": datetime.now().isoformat(),
     }
 
 
 # Mood Tracking Tool State
-_mood_history: List[Dict[str, Any]] = []
+# Only the scores the trend needs are kept, in fixed-size windows with running
+# sums, so memory stays bounded and each update is O(1).
+_MOOD_WINDOW_SIZE = 7
+_RECENT_WINDOW_SIZE = 3
+
+_mood_window: Deque[int] = deque(maxlen=_MOOD_WINDOW_SIZE)
+_recent_window: Deque[int] = deque(maxlen=_RECENT_WINDOW_SIZE)
+_mood_window_sum = 0
+_recent_window_sum = 0
+_mood_entry_count = 0
 
 
 def log_mood(mood_score: int, emotions: List[str], notes: str = "") -> Dict[str, Any]:
@@ -70,7 +126,7 @@ def log_mood(mood_score: int, emotions: List[str], notes: str = "") -> Dict[str,
     Returns:
         Dict containing the logged entry and current trend analysis
     """
-    global _mood_history
+    global _mood_window_sum, _recent_window_sum, _mood_entry_count
 
     entry = {
         "timestamp": datetime.now().isoformat(),
@@ -79,32 +135,41 @@ def log_mood(mood_score: int, emotions: List[str], notes: str = "") -> Dict[str,
         "notes": notes,
     }
 
-    _mood_history.append(entry)
+    # Subtract scores about to be evicted from the full windows
+    if len(_mood_window) == _MOOD_WINDOW_SIZE:
+        _mood_window_sum -= _mood_window[0]
+    if len(_recent_window) == _RECENT_WINDOW_SIZE:
+        _recent_window_sum -= _recent_window[0]
+
+    _mood_window.append(mood_score)
+    _recent_window.append(mood_score)
+    _mood_window_sum += mood_score
+    _recent_window_sum += mood_score
+    _mood_entry_count += 1
 
     # Calculate trend if we have enough data
     trend = _calculate_mood_trend()
 
-    return {"entry": entry, "trend": trend, "total_entries": len(_mood_history)}
+    return {"entry": entry, "trend": trend, "total_entries": _mood_entry_count}
 
 
 def _calculate_mood_trend() -> Dict[str, Any]:
     """Calculates mood trends from recent history."""
-    global _mood_history
+    count = len(_mood_window)
 
-    if len(_mood_history) < 2:
+    if count < 2:
         return {"status": "insufficient_data"}
 
-    # Get last 7 entries
-    recent = _mood_history[-7:]
-    scores = [entry["mood_score"] for entry in recent]
-
-    avg_score = sum(scores) / len(scores)
+    # Average over the last 7 entries
+    avg_score = _mood_window_sum / count
 
     # Calculate trend direction
-    if len(scores) >= 3:
-        recent_avg = sum(scores[-3:]) / 3
+    if count >= 3:
+        recent_avg = _recent_window_sum / _RECENT_WINDOW_SIZE
         older_avg = (
-            sum(scores[:-3]) / len(scores[:-3]) if len(scores) > 3 else scores[0]
+            (_mood_window_sum - _recent_window_sum) / (count - _RECENT_WINDOW_SIZE)
+            if count > _RECENT_WINDOW_SIZE
+            else _mood_window[0]
         )
 
         if recent_avg > older_avg + 1:
@@ -120,11 +185,18 @@ def _calculate_mood_trend() -> Dict[str, Any]:
         "status": "calculated",
         "average_score": round(avg_score, 2),
         "direction": direction,
-        "entries_analyzed": len(recent),
+        "entries_analyzed": count,
     }
 
 
 # Resource Finder Tool
+# Fallback for unknown locations, merged once instead of on every request
+_MERGED_RESOURCES = {
+    **CRISIS_RESOURCES.get("us", {}),
+    **CRISIS_RESOURCES.get("international", {}),
+}
+
+
 def get_crisis_resources(location: str = "us") -> Dict[str, Any]:
     """
     Retrieves crisis resources based on location.
@@ -137,15 +209,8 @@ def get_crisis_resources(location: str = "us") -> Dict[str, Any]:
     """
     location_lower = location.lower()
 
-    # Get resources for location
-    if location_lower in CRISIS_RESOURCES:
-        resources = CRISIS_RESOURCES[location_lower]
-    else:
-        # Default to US and international
-        resources = {
-            **CRISIS_RESOURCES.get("us", {}),
-            **CRISIS_RESOURCES.get("international", {}),
-        }
+    # Get resources for location, defaulting to US and international
+    resources = CRISIS_RESOURCES.get(location_lower, _MERGED_RESOURCES)
 
     return {
         "location": location,
@@ -188,6 +253,10 @@ _coping_strategies = {
     ],
 }
 
+# Freeze strategy lists so callers can't mutate the shared tables
+_coping_strategies = {k: tuple(v) for k, v in _coping_strategies.items()}
+_DEFAULT_STRATEGIES = _coping_strategies["stress"]
+
 
 def get_coping_strategies(situation: str) -> Dict[str, Any]:
     """
@@ -199,8 +268,7 @@ def get_coping_strategies(situation: str) -> Dict[str, Any]:
     Returns:
         Dict containing relevant coping strategies
     """
-    situation_lower = situation.lower()
-    strategies = _coping_strategies.get(situation_lower, _coping_strategies["stress"])
+    strategies = _coping_strategies.get(situation.lower(), _DEFAULT_STRATEGIES)
 
     return {
         "situation": situation,
@@ -210,7 +278,7 @@ def get_coping_strategies(situation: str) -> Dict[str, Any]:
 
 
 # Create ADK FunctionTool objects (ADK automatically extracts function signatures and docstrings)
-crisis_detection_tool = FunctionTool(detect_crisis)
+# detect_crisis is not wrapped: adk_main runs it on every message before the agents see it
 mood_tracking_tool = FunctionTool(log_mood)
 resource_finder_tool = FunctionTool(get_crisis_resources)
 coping_strategies_tool = FunctionTool(get_coping_strategies)
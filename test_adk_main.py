@@ -0,0 +1,53 @@
+"""
+Tests for MindfulAI message routing.
+"""
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from adk_main import route_fast_path
+from adk_tools import detect_crisis
+
+
+def route(text, last_turn_crisis=False):
+    return route_fast_path(text, detect_crisis(text), last_turn_crisis)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "I'm going to kill myself tonight",
+        "I've been self-harming and I'm so stressed",
+        "can you find me a therapist, I want to die",
+        "there's no hope",
+    ],
+)
+def test_flagged_messages_go_to_crisis_agent(text):
+    assert route(text) == "crisis"
+    assert route(text, last_turn_crisis=True) == "crisis"
+
+
+def test_resource_request_skips_triage():
+    assert route("Can you help me find a therapist?") == "resource"
+
+
+def test_coping_request_skips_triage():
+    assert route("I'm so stressed about exams") == "support"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "I'm anxious, can you find me a therapist?",
+        "hello there",
+        "I need someone to talk to",
+    ],
+)
+def test_ambiguous_or_general_messages_use_coordinator(text):
+    assert route(text) is None
+
+
+def test_no_fast_path_after_crisis_turn():
+    assert route("Can you help me find a therapist?", last_turn_crisis=True) is None
+    assert route("I'm so stressed about exams", last_turn_crisis=True) is None
@@ -0,0 +1,42 @@
+"""
+Regression tests for the MindfulAI crisis detector.
+"""
+
+import pytest
+
+pytest.importorskip("google.adk")
+
+from adk_tools import detect_crisis
+
+
+@pytest.mark.parametrize(
+    "text, keyword",
+    [
+        ("I've been self-harming again", "self-harm"),
+        ("I overdosed last week", "overdose"),
+        ("he keeps guns in the house", "gun"),
+        ("I bought a handgun", "handgun"),
+        ("there's a shotgun in the closet", "shotgun"),
+        ("I keep thinking about a gunshot", "gunshot"),
+        ("I can’t go on", "can't go on"),
+        ("I cant go on anymore", "can't go on"),
+        ("thinking about suicide.", "suicide"),
+    ],
+)
+def test_detects_inflected_and_punctuated_keywords(text, keyword):
+    result = detect_crisis(text)
+    assert result["is_crisis"]
+    assert keyword in result["matched_keywords"]
+
+
+@pytest.mark.parametrize("text", ["pillsbury dough", "I've begun a new job"])
+def test_ignores_keywords_inside_other_words(text):
+    result = detect_crisis(text)
+    assert not result["is_crisis"]
+    assert result["matched_keywords"] == []
+
+
+def test_reports_each_keyword_once():
+    result = detect_crisis("I want to die, I want to die tonight")
+    assert result["matched_keywords"] == ["want to die", "tonight"]
+    assert result["severity_level"] == "CRITICAL"